@@ -3,27 +3,61 @@
 from .execute import (
     ask_claude_for_description,
     ask_claude_for_keywords,
+    generate_description_batch,
+    generate_description_fast,
     generate_description_sync,
+    generate_description_via_claude,
+    generate_description_via_claude_batch,
+    generate_keywords_batch,
+    generate_keywords_fast,
     generate_keywords_sync,
+    generate_keywords_via_claude,
+    generate_keywords_via_claude_batch,
+    get_client_options,
+    query_claude_batch,
     query_claude_general,
+    query_claude_general_local,
+    query_claude_local_sync,
     query_claude_sync,
 )
-from .initialize import metadata_server
+from .initialize import get_metadata_server
 from .tools import (
     call_graphql_endpoint_tool,
     generate_description_tool,
     generate_keywords_tool,
+    graphql_mutation_tool,
+    graphql_query_tool,
 )
 
 __all__ = [
     "ask_claude_for_description",
     "ask_claude_for_keywords",
+    "generate_description_batch",
+    "generate_description_fast",
     "generate_description_sync",
+    "generate_description_via_claude",
+    "generate_description_via_claude_batch",
+    "generate_keywords_batch",
+    "generate_keywords_fast",
     "generate_keywords_sync",
+    "generate_keywords_via_claude",
+    "generate_keywords_via_claude_batch",
+    "get_client_options",
+    "query_claude_batch",
     "query_claude_general",
+    "query_claude_general_local",
+    "query_claude_local_sync",
     "query_claude_sync",
-    "metadata_server",
+    "get_metadata_server",
     "call_graphql_endpoint_tool",
     "generate_description_tool",
     "generate_keywords_tool",
+    "graphql_mutation_tool",
+    "graphql_query_tool",
 ]
+
+# metadata_server used to be exported directly; keep it importable, built on first access
+def __getattr__(name):
+    if name == "metadata_server":
+        return get_metadata_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
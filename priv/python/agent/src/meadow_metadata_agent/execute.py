@@ -1,47 +1,252 @@
 import asyncio
+import atexit
+import functools
 import json
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from hashlib import blake2b
 from claude_code_sdk import ClaudeCodeOptions, ClaudeSDKClient
-from meadow_metadata_agent.initialize import metadata_server
-
-client_options = ClaudeCodeOptions(
-    mcp_servers={"metadata": metadata_server},
-    allowed_tools=[
-        # "mcp__metadata__generate_keywords",
-        # "mcp__metadata__generate_description",
-        "mcp__metadata__call_graphql_endpoint",
-    ],
-    disallowed_tools=["Bash", "Grep"],
-    system_prompt="Answer questions ONLY using the graphql tools available. Do not look for information in the file system or local codebase."
+from meadow_metadata_agent.initialize import get_metadata_server
+from meadow_metadata_agent.tools import (
+    bind_http_client,
+    close_http_client,
+    generate_description,
+    generate_keywords,
 )
 
-# Global variables for client management
-global_client = None
-client_options_global = client_options
+@functools.lru_cache(maxsize=1)
+def get_client_options():
+    return ClaudeCodeOptions(
+        mcp_servers={"metadata": get_metadata_server()},
+        allowed_tools=[
+            # "mcp__metadata__generate_keywords",
+            # "mcp__metadata__generate_description",
+            "mcp__metadata__graphql_query",
+            "mcp__metadata__graphql_mutation",
+        ],
+        disallowed_tools=["Bash", "Grep"],
+        system_prompt="Answer questions ONLY using the graphql tools available. Use graphql_query for reads and schema discovery, and graphql_mutation only to change data. Do not look for information in the file system or local codebase."
+    )
 
-async def query_claude_general(prompt, context_json):
-    # Parse context and include it in the prompt
+# client_options and client_options_global used to be built at import; keep
+# them importable, built on first access
+def __getattr__(name):
+    if name in ("client_options", "client_options_global"):
+        return get_client_options()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+logger = logging.getLogger(__name__)
+
+# Global variables for client management. The pool is only ever touched from
+# _loop; public coroutines awaited on any other loop are forwarded there.
+#
+# A ClaudeSDKClient is one continuing conversation, so a client is never
+# reused: each one serves a single exchange and is then disconnected, which
+# keeps every prompt independent of whatever ran before it. What the pool
+# saves is the connect latency: spare_client_count clients are connected
+# ahead of time and replaced as they are taken, and a call that finds no
+# spare ready connects its own. At most client_pool_size exchanges run at
+# once.
+client_pool_size = int(os.getenv("MEADOW_CLIENT_POOL_SIZE", "4"))
+if client_pool_size < 1:
+    logger.warning("MEADOW_CLIENT_POOL_SIZE=%d is below 1; using 1", client_pool_size)
+    client_pool_size = 1
+spare_client_count = 1
+_client_slots = asyncio.Semaphore(client_pool_size)
+_ready_clients = deque()
+_spare_count = 0
+_client_owners = set()
+_shut_down = False
+
+# Opt-in LRU cache of query_claude_sync responses, keyed by prompt and context
+use_response_cache = os.getenv("MEADOW_LLM_CACHE") == "1"
+response_cache_size = 1024
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Persistent event loop shared by the sync, batch and async entry points
+_loop = asyncio.new_event_loop()
+_loop_thread = threading.Thread(target=_loop.run_forever, name="meadow-metadata-agent", daemon=True)
+_loop_thread.start()
+bind_http_client(_loop)
+
+def _run(coro):
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("Cannot block on the agent event loop from code running on it")
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+def _on_agent_loop(fn):
+    """Run the decorated coroutine function on _loop, whichever loop awaits it."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if asyncio.get_running_loop() is _loop:
+            return await fn(*args, **kwargs)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(fn(*args, **kwargs), _loop))
+    return wrapper
+
+async def _batch(fn, items):
+    return await asyncio.gather(*(fn(*args) for args in items))
+
+def _settle(done, result=None, error=None):
+    if done.done():
+        return
+    if isinstance(error, asyncio.CancelledError):
+        done.cancel()
+    elif error is not None:
+        done.set_exception(error)
+    else:
+        done.set_result(result)
+
+def _start_client_owner(connected):
+    _client_owners.add(asyncio.create_task(_client_owner(connected)))
+
+def _start_spare_clients():
+    global _spare_count
+    while _spare_count < spare_client_count and not _shut_down:
+        _spare_count += 1
+        connected = asyncio.get_running_loop().create_future()
+        connected.add_done_callback(_add_spare_client)
+        _start_client_owner(connected)
+
+def _add_spare_client(connected):
+    global _spare_count
+    error = connected.exception()
+    if error is not None:
+        # Nobody is waiting on a spare, so its connect error is only logged;
+        # the next call connects a client of its own.
+        _spare_count -= 1
+        logger.warning("Failed to connect a spare ClaudeSDKClient: %s", error)
+    elif _shut_down:
+        _spare_count -= 1
+        connected.result().set_result(None)
+    else:
+        _ready_clients.append(connected.result())
+
+async def _client_owner(connected):
+    """Own one ClaudeSDKClient from connect to disconnect.
+
+    The SDK requires a client to be connected, used and disconnected from the
+    same task, so callers never touch the client directly. Once connected,
+    the owner resolves ``connected`` with a handoff future (or with the
+    connect error); whoever takes the handoff sets ``(exchange, future)`` and
+    this task awaits ``exchange(client)``. After that single exchange the
+    client is disconnected. A handoff resolved with ``None``, or a
+    ``connected`` future cancelled by its caller, stops the owner unused.
+    """
+    client = None
+    try:
+        try:
+            client = ClaudeSDKClient(options=get_client_options())
+            await client.connect()
+        except Exception as error:
+            _settle(connected, error=error)
+            return
+
+        handoff = asyncio.get_running_loop().create_future()
+        _settle(connected, handoff)
+        if connected.cancelled():
+            return
+        item = await handoff
+        if item is None:
+            return
+        exchange, done = item
+        try:
+            result = await exchange(client)
+        except BaseException as error:
+            _settle(done, error=error)
+            if not isinstance(error, Exception):
+                raise
+        else:
+            _settle(done, result)
+    finally:
+        _client_owners.discard(asyncio.current_task())
+        if client is not None:
+            try:
+                await client.disconnect()
+            except Exception:
+                logger.exception("Failed to disconnect ClaudeSDKClient")
+
+async def _with_client(exchange):
+    """Run ``exchange(client)`` on a freshly connected client and return its result."""
+    global _spare_count
+    async with _client_slots:
+        handoff = _ready_clients.popleft() if _ready_clients else None
+        if handoff is not None:
+            _spare_count -= 1
+        _start_spare_clients()
+        if handoff is None:
+            connected = asyncio.get_running_loop().create_future()
+            _start_client_owner(connected)
+            try:
+                handoff = await connected
+            except asyncio.CancelledError:
+                # The owner may have connected just as this call was cancelled
+                if connected.done() and not connected.cancelled() and connected.exception() is None:
+                    connected.result().set_result(None)
+                raise
+        done = asyncio.get_running_loop().create_future()
+        handoff.set_result((exchange, done))
+        return await done
+
+async def _query_text(client, prompt):
+    await client.query(prompt)
+    chunks = []
+    async for message in client.receive_response():
+        content = getattr(message, 'content', None)
+        if content is not None:
+            for block in content:
+                text = getattr(block, 'text', None)
+                if text is not None:
+                    chunks.append(text)
+        else:
+            text = getattr(message, 'text', None)
+            if text is not None:
+                chunks.append(text)
+    return "".join(chunks)
+
+async def _close_clients():
+    global _spare_count
+    while _ready_clients:
+        _spare_count -= 1
+        _ready_clients.popleft().set_result(None)
+    if _client_owners:
+        _, pending = await asyncio.wait(set(_client_owners), timeout=10)
+        if pending:
+            logger.warning("%d ClaudeSDKClient(s) still busy at shutdown", len(pending))
+    await close_http_client()
+
+def _shutdown():
+    global _shut_down
+    if _shut_down:
+        return
+    _shut_down = True
+    if _loop.is_running():
+        try:
+            asyncio.run_coroutine_threadsafe(_close_clients(), _loop).result(timeout=15)
+        except Exception:
+            logger.exception("Failed to close Claude clients at shutdown")
+    _loop.call_soon_threadsafe(_loop.stop)
+
+atexit.register(_shutdown)
+
+@_on_agent_loop
+async def query_claude_general(prompt, context_json=""):
+    # Validate the context, but embed the JSON text as received rather than re-serializing it
     context_data = json.loads(context_json) if context_json else {}
 
     # Build enhanced prompt with context
     enhanced_prompt = prompt
     if context_data:
-        enhanced_prompt += f"\n\nContext data: {json.dumps(context_data, indent=2)}"
+        enhanced_prompt += "\n\nContext data: " + context_json
         enhanced_prompt += "\n\nPlease use the available tools (generate_keywords, generate_description) if they would help answer this query."
 
-    # Use client as context manager
-    async with ClaudeSDKClient(options=client_options_global) as client:
-        await client.query(enhanced_prompt)
-        result = ""
-        async for message in client.receive_response():
-            if hasattr(message, 'content'):
-                for block in message.content:
-                    if hasattr(block, 'text'):
-                        result += block.text
-            elif hasattr(message, 'text'):
-                result += message.text
-        return result
-
-async def query_claude_general_local(prompt, context_json):
+    return await _with_client(lambda client: _query_text(client, enhanced_prompt))
+
+@_on_agent_loop
+async def query_claude_general_local(prompt, context_json=""):
     context_data = json.loads(context_json) if context_json else {}
 
     # Build a more explicit prompt that encourages tool usage
@@ -53,11 +258,11 @@ async def query_claude_general_local(prompt, context_json):
     Context data: {json.dumps(context_data, indent=2) if context_data else "None"}
 
     Please use the appropriate tools to help answer this query. For example:
-    - Before using the `call_graphql_endpoint` tool to query or update data, use it to discover the schema first.
+    - Before using the `graphql_query` or `graphql_mutation` tools to query or update data, use `graphql_query` to discover the schema first.
 
     Respond with both tool results and your analysis."""
 
-    async with ClaudeSDKClient(options=client_options) as client:
+    async def exchange(client):
         await client.query(enhanced_prompt)
         conversation_log = []
 
@@ -65,11 +270,13 @@ async def query_claude_general_local(prompt, context_json):
 
         async for message in client.receive_response():
             print(f"MESSAGE: {message}")
-            if hasattr(message, 'content'):
-                for block in message.content:
-                    if hasattr(block, 'text'):
+            content = getattr(message, 'content', None)
+            if content is not None:
+                for block in content:
+                    text = getattr(block, 'text', None)
+                    if text is not None:
                         # Claude's text responses - don't store, just log
-                        print(f"CLAUDE: {block.text}")
+                        print(f"CLAUDE: {text}")
                     elif hasattr(block, 'tool_use_id'):
                         # Tool execution results - extract and immediately log
                         if isinstance(block.content, list) and len(block.content) > 0:
@@ -85,52 +292,89 @@ async def query_claude_general_local(prompt, context_json):
                         tool_call = f"🛠️  Using tool '{block.name}' with args: {tool_args}"
                         print(f"TOOL CALL: {tool_call}")  # Log immediately
 
-            elif hasattr(message, 'result'):
+            else:
                 # Final result from ResultMessage - this is what we return
-                if message.result:
-                    final_result = message.result
+                result = getattr(message, 'result', None)
+                if result:
+                    final_result = result
                     print(f"FINAL: {final_result}")
 
         # Return just the final result content
         return final_result or "No result generated"
 
-async def ask_claude_for_keywords(content, context, max_keywords):
+    return await _with_client(exchange)
+
+@_on_agent_loop
+async def ask_claude_for_keywords(content, context="", max_keywords=10):
     prompt = f"Please analyze this content and generate {max_keywords} relevant keywords using the generate_keywords tool. Content: {content}. Context: {context}"
 
-    async with ClaudeSDKClient(options=client_options_global) as client:
-        await client.query(prompt)
-        result = ""
-        async for message in client.receive_response():
-            if hasattr(message, 'content'):
-                for block in message.content:
-                    if hasattr(block, 'text'):
-                        result += block.text
-            elif hasattr(message, 'text'):
-                result += message.text
-        return result
-
-async def ask_claude_for_description(content, context, max_length):
+    return await _with_client(lambda client: _query_text(client, prompt))
+
+@_on_agent_loop
+async def ask_claude_for_description(content, context="", max_length=400):
     prompt = f"Please analyze this content and generate a description (max {max_length} chars) using the generate_description tool. Content: {content}. Context: {context}"
 
-    async with ClaudeSDKClient(options=client_options_global) as client:
-        await client.query(prompt)
-        result = ""
-        async for message in client.receive_response():
-            if hasattr(message, 'content'):
-                for block in message.content:
-                    if hasattr(block, 'text'):
-                        result += block.text
-            elif hasattr(message, 'text'):
-                result += message.text
-        return result
+    return await _with_client(lambda client: _query_text(client, prompt))
+
+# The keyword and description tools are deterministic Python, so the *_fast
+# variants call them directly instead of asking Claude to call them.
+def generate_keywords_fast(content, context="", max_keywords=10):
+    return generate_keywords(content, context, max_keywords)
+
+def generate_description_fast(content, context="", max_length=400):
+    return generate_description(content, context, max_length)
+
+def generate_keywords_via_claude(content, context="", max_keywords=10):
+    return _run(ask_claude_for_keywords(content, context, max_keywords))
+
+def generate_description_via_claude(content, context="", max_length=400):
+    return _run(ask_claude_for_description(content, context, max_length))
 
 def generate_keywords_sync(content, context="", max_keywords=10):
-    return asyncio.run(ask_claude_for_keywords(content, context, max_keywords))
+    return generate_keywords_fast(content, context, max_keywords)
 
 def generate_description_sync(content, context="", max_length=400):
-    return asyncio.run(ask_claude_for_description(content, context, max_length))
+    return generate_description_fast(content, context, max_length)
+
+# Entry point for MeadowAI.MetadataAgent (see integration/agent_integration.py).
+# Each call runs on its own freshly connected client, so separate Elixir
+# queries never see each other's prompts or GraphQL results.
+def query_claude_local_sync(prompt, context_json=""):
+    return _run(query_claude_general_local(prompt, context_json))
 
 def query_claude_sync(prompt, context_json=""):
-    return asyncio.run(query_claude_general(prompt, context_json))
+    if not use_response_cache:
+        return _run(query_claude_general(prompt, context_json))
+
+    key = blake2b(f"{prompt}\x00{context_json}".encode(), digest_size=16).hexdigest()
+    with _response_cache_lock:
+        if key in _response_cache:
+            _response_cache.move_to_end(key)
+            return _response_cache[key]
+
+    result = _run(query_claude_general(prompt, context_json))
+    with _response_cache_lock:
+        _response_cache[key] = result
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > response_cache_size:
+            _response_cache.popitem(last=False)
+    return result
+
+# Batch variants take an iterable of argument tuples matching the sync
+# signatures, e.g. [(content,), (content, context, 5)]. Like their *_sync
+# counterparts, the keyword and description batches run locally; the
+# *_via_claude_batch variants run the Claude requests concurrently.
+def generate_keywords_batch(items):
+    return [generate_keywords_fast(*args) for args in items]
+
+def generate_description_batch(items):
+    return [generate_description_fast(*args) for args in items]
+
+def generate_keywords_via_claude_batch(items):
+    return _run(_batch(ask_claude_for_keywords, items))
+
+def generate_description_via_claude_batch(items):
+    return _run(_batch(ask_claude_for_description, items))
 
-print("MetadataAgent Python tools initialized successfully")
\ No newline at end of file
+def query_claude_batch(items):
+    return _run(_batch(query_claude_general, items))
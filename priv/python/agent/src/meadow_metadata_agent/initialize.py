@@ -1,9 +1,11 @@
+import functools
 import os
 from claude_code_sdk import create_sdk_mcp_server
 from .tools import (
-    call_graphql_endpoint_tool,
     generate_description_tool,
     generate_keywords_tool,
+    graphql_mutation_tool,
+    graphql_query_tool,
 )
 
 aws_bearer_token = os.getenv("AWS_BEARER_TOKEN_BEDROCK")
@@ -15,9 +17,17 @@ if use_bedrock:
 else:
     print("Using Anthropic API (not Bedrock)")
 
-# Create MCP server with our tools
-metadata_server = create_sdk_mcp_server(
-    name="metadata",
-    version="1.0.0",
-    tools=[call_graphql_endpoint_tool, generate_keywords_tool, generate_description_tool]
-)
+# Create MCP server with our tools on first use rather than at import
+@functools.lru_cache(maxsize=1)
+def get_metadata_server():
+    return create_sdk_mcp_server(
+        name="metadata",
+        version="1.0.0",
+        tools=[graphql_query_tool, graphql_mutation_tool, generate_keywords_tool, generate_description_tool]
+    )
+
+# metadata_server used to be built at import; keep it importable, built on first access
+def __getattr__(name):
+    if name == "metadata_server":
+        return get_metadata_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
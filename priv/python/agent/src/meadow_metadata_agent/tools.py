@@ -1,14 +1,71 @@
 from claude_code_sdk import tool
+from collections import Counter
 from typing import Any
-import json
+import asyncio
+import httpx
 import os
-import requests
+import re
 
-@tool("call_graphql_endpoint", "Call a GraphQL endpoint", {
-    "graphql_query": str,
-    "graphql_vars": dict
-})
-async def call_graphql_endpoint_tool(args: dict[str, Any]) -> dict[str, Any]:
+# Words of four or more characters; shorter tokens are ignored as keywords
+_WORD_RE = re.compile(r'\b\w{4,}\b')
+
+# Pooled keep-alive HTTP client for GraphQL calls. It only lives on the loop
+# passed to bind_http_client (the agent's persistent loop); calls from any
+# other loop get a client of their own that is closed before they return,
+# so no connection outlives the loop that opened it.
+_http = None
+_http_loop = None
+
+def bind_http_client(loop):
+    global _http_loop
+    _http_loop = loop
+
+def _new_http_client():
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+
+async def _post(url, **kwargs):
+    global _http
+    if asyncio.get_running_loop() is _http_loop:
+        if _http is None:
+            _http = _new_http_client()
+        return await _http.post(url, **kwargs)
+    async with _new_http_client() as client:
+        return await client.post(url, **kwargs)
+
+async def close_http_client():
+    global _http
+    client, _http = _http, None
+    if client is not None:
+        await client.aclose()
+
+# GraphQL tokens that matter for finding operation keywords: block strings,
+# strings and comments (so their contents are skipped), brackets, and names
+_GRAPHQL_TOKEN_RE = re.compile(
+    r'"""(?:\\"""|.)*?"""|"(?:\\.|[^"\\\n])*"|#[^\n]*|[{}()]|[_A-Za-z][_0-9A-Za-z]*',
+    re.S,
+)
+
+def _has_mutation(document: str) -> bool:
+    """Return True if any top-level operation in a GraphQL document is a mutation."""
+    depth = 0
+    for token in _GRAPHQL_TOKEN_RE.findall(document):
+        if token in ("{", "("):
+            depth += 1
+        elif token in ("}", ")"):
+            depth = max(depth - 1, 0)
+        elif depth == 0 and token == "mutation":
+            return True
+    return False
+
+# Reads and writes are separate tools so reads can be flagged read-only
+# (readOnlyHint) and run in parallel. claude-code-sdk's @tool does not take
+# MCP annotations yet, so the split is in place for when it does.
+async def _call_graphql_endpoint(args: dict[str, Any]) -> dict[str, Any]:
     graphql_query = args.get("graphql_query", "")
     graphql_vars = args.get("graphql_vars", {})
 
@@ -24,42 +81,75 @@ async def call_graphql_endpoint_tool(args: dict[str, Any]) -> dict[str, Any]:
     if not graphql_endpoint:
         return {"content": [{"type": "text", "text": "Error: GraphQL endpoint not provided"}]}
 
-    response = requests.post(
+    response = await _post(
         graphql_endpoint,
         json={"query": graphql_query, "variables": graphql_vars},
         headers=headers,
-        timeout=30,
     )
     if response.status_code == 200:
-        return {"content": [{"type": "text", "text": json.dumps(response.json())}]}
+        # Pass the server's JSON through as-is rather than parsing and re-serializing it
+        return {"content": [{"type": "text", "text": response.text}]}
     return {"content": [{"type": "text", "text": f"Error: {response.status_code} - {response.text}"}]}
 
+@tool("graphql_query", "Run a read-only GraphQL query (including schema introspection)", {
+    "graphql_query": str,
+    "graphql_vars": dict
+})
+async def graphql_query_tool(args: dict[str, Any]) -> dict[str, Any]:
+    if _has_mutation(args.get("graphql_query", "")):
+        return {"content": [{"type": "text", "text": "Error: mutations must use the graphql_mutation tool"}]}
+    return await _call_graphql_endpoint(args)
+
+@tool("graphql_mutation", "Run a GraphQL mutation that updates data", {
+    "graphql_query": str,
+    "graphql_vars": dict
+})
+async def graphql_mutation_tool(args: dict[str, Any]) -> dict[str, Any]:
+    return await _call_graphql_endpoint(args)
+
+# Deprecated: the original combined tool, kept for importers. It is not
+# registered with the metadata server; use graphql_query_tool or
+# graphql_mutation_tool instead.
+@tool("call_graphql_endpoint", "Call a GraphQL endpoint", {
+    "graphql_query": str,
+    "graphql_vars": dict
+})
+async def call_graphql_endpoint_tool(args: dict[str, Any]) -> dict[str, Any]:
+    return await _call_graphql_endpoint(args)
+
+# Plain implementations behind the keyword and description tools, so callers
+# that do not need Claude can run them without an event loop
+def generate_keywords(content: str, context: str = "", max_keywords: int = 10) -> str:
+    word_freq = Counter(_WORD_RE.findall(content.lower()))
+    if context:
+        word_freq.update(_WORD_RE.findall(context.lower()))
+
+    return ", ".join(word for word, _ in word_freq.most_common(max_keywords))
+
+def generate_description(content: str, context: str = "", max_length: int = 400) -> str:
+    prefix = f"Analysis of content in context of {context}" if context else "Analysis of content"
+    # Cap the excerpt so prefix + ": " + excerpt + "..." fits within max_length
+    excerpt_length = min(100, max_length - len(prefix) - 5)
+    if excerpt_length >= 0:
+        return f"{prefix}: {content[:excerpt_length]}..."
+    return f"{prefix}: {content[:100]}..."[:max_length-3] + "..."
+
 @tool("generate_keywords", "Generate relevant keywords from content", {
     "content": str,
     "context": str,
     "max_keywords": int
 })
 async def generate_keywords_tool(args: dict[str, Any]) -> dict[str, Any]:
-    content = args.get("content", "")
-    context = args.get("context", "")
-    max_keywords = args.get("max_keywords", 10)
-
-    import re
-    words = re.findall(r'\b\w+\b', content.lower())
-    context_words = re.findall(r'\b\w+\b', context.lower()) if context else []
-
-    all_words = words + context_words
-    word_freq = {}
-    for word in all_words:
-        if len(word) > 3:
-            word_freq[word] = word_freq.get(word, 0) + 1
-
-    keywords = sorted(word_freq.keys(), key=lambda x: word_freq[x], reverse=True)[:max_keywords]
+    keywords = generate_keywords(
+        args.get("content", ""),
+        args.get("context", ""),
+        args.get("max_keywords", 10),
+    )
 
     return {
         "content": [{
             "type": "text",
-            "text": ", ".join(keywords)
+            "text": keywords
         }]
     }
 
@@ -69,17 +159,11 @@ async def generate_keywords_tool(args: dict[str, Any]) -> dict[str, Any]:
     "max_length": int
 })
 async def generate_description_tool(args: dict[str, Any]) -> dict[str, Any]:
-    content = args.get("content", "")
-    context = args.get("context", "")
-    max_length = args.get("max_length", 400)
-
-    description = f"Analysis of content"
-    if context:
-        description += f" in context of {context}"
-    description += f": {content[:100]}..."
-
-    if len(description) > max_length:
-        description = description[:max_length-3] + "..."
+    description = generate_description(
+        args.get("content", ""),
+        args.get("context", ""),
+        args.get("max_length", 400),
+    )
 
     return {
         "content": [{
@@ -0,0 +1,175 @@
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from meadow_metadata_agent import execute
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    async def fake_query(prompt, context_json=""):
+        calls.append((prompt, context_json))
+        return f"answer {len(calls)}"
+
+    monkeypatch.setattr(execute, "query_claude_general", fake_query)
+    monkeypatch.setattr(execute, "use_response_cache", True)
+    monkeypatch.setattr(execute, "response_cache_size", 2)
+    monkeypatch.setattr(execute, "_response_cache", OrderedDict())
+    return calls
+
+
+def test_query_claude_sync_returns_cached_response_for_same_prompt_and_context(calls):
+    assert execute.query_claude_sync("keywords?", '{"id": 1}') == "answer 1"
+    assert execute.query_claude_sync("keywords?", '{"id": 1}') == "answer 1"
+    assert execute.query_claude_sync("keywords?", '{"id": 2}') == "answer 2"
+
+    assert calls == [("keywords?", '{"id": 1}'), ("keywords?", '{"id": 2}')]
+
+
+def test_query_claude_sync_evicts_least_recently_used(calls):
+    execute.query_claude_sync("a")
+    execute.query_claude_sync("b")
+    execute.query_claude_sync("a")  # hit; "b" is now least recently used
+    execute.query_claude_sync("c")  # evicts "b"
+
+    assert len(execute._response_cache) == 2
+    assert execute.query_claude_sync("a") == "answer 1"
+    assert execute.query_claude_sync("b") == "answer 4"
+    assert [prompt for prompt, _ in calls] == ["a", "b", "c", "b"]
+
+
+def test_query_claude_sync_skips_cache_when_disabled(calls, monkeypatch):
+    monkeypatch.setattr(execute, "use_response_cache", False)
+
+    execute.query_claude_sync("a")
+    execute.query_claude_sync("a")
+
+    assert len(calls) == 2
+    assert not execute._response_cache
+
+
+def test_removed_module_attributes_stay_importable():
+    from meadow_metadata_agent import metadata_server
+    from meadow_metadata_agent.execute import client_options, client_options_global
+    from meadow_metadata_agent.initialize import get_metadata_server
+
+    assert metadata_server is get_metadata_server()
+    assert client_options is client_options_global is execute.get_client_options()
+    assert client_options.mcp_servers == {"metadata": metadata_server}
+
+
+class FakeClient:
+    """Stands in for ClaudeSDKClient and records which task drives each call."""
+    connect_error = None
+    active = 0
+    max_active = 0
+
+    def __init__(self, options=None):
+        self.task = None
+        self.prompts = []
+        self.disconnected_by_owner = False
+        type(self).instances.append(self)
+
+    async def connect(self):
+        self.task = asyncio.current_task()
+        await asyncio.sleep(0)
+        if type(self).connect_error is not None:
+            raise type(self).connect_error
+
+    async def query(self, prompt):
+        assert asyncio.current_task() is self.task
+        self.prompts.append(prompt)
+
+    async def receive_response(self):
+        cls = type(self)
+        cls.active += 1
+        cls.max_active = max(cls.max_active, cls.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.prompts[-1] == "boom":
+                raise RuntimeError("exchange failed")
+            yield SimpleNamespace(content=[SimpleNamespace(text=f"reply to {self.prompts[-1]}")])
+        finally:
+            cls.active -= 1
+
+    async def disconnect(self):
+        self.disconnected_by_owner = asyncio.current_task() is self.task
+
+
+def _shut_down_pool(monkeypatch):
+    monkeypatch.setattr(execute, "_shut_down", True)
+    execute._run(execute._close_clients())
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    fake = type("FakeClaudeSDKClient", (FakeClient,), {"instances": []})
+    monkeypatch.setattr(execute, "ClaudeSDKClient", fake)
+    monkeypatch.setattr(execute, "get_client_options", lambda: None)
+    yield fake
+    _shut_down_pool(monkeypatch)
+
+
+def test_each_exchange_runs_on_its_own_client(fake_client):
+    answers = [execute.query_claude_sync(prompt) for prompt in ("a", "b", "c")]
+
+    assert answers == ["reply to a", "reply to b", "reply to c"]
+    served = sorted(client.prompts for client in fake_client.instances if client.prompts)
+    assert served == [["a"], ["b"], ["c"]]
+
+
+def test_concurrent_exchanges_are_capped_at_the_pool_size(fake_client, monkeypatch):
+    monkeypatch.setattr(execute, "_client_slots", asyncio.Semaphore(2))
+
+    answers = execute.query_claude_batch([(str(n),) for n in range(6)])
+
+    assert answers == [f"reply to {n}" for n in range(6)]
+    assert fake_client.max_active == 2
+
+
+def test_connect_failure_is_raised_to_the_caller(fake_client):
+    fake_client.connect_error = ConnectionError("CLI unavailable")
+
+    with pytest.raises(ConnectionError, match="CLI unavailable"):
+        execute.query_claude_sync("a")
+
+
+def test_calls_succeed_as_soon_as_connects_recover(fake_client):
+    fake_client.connect_error = ConnectionError("CLI unavailable")
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            execute.query_claude_sync("a")
+
+    # Spare clients that failed during the outage must not fail later calls
+    fake_client.connect_error = None
+    answers = [execute.query_claude_sync(str(n)) for n in range(4)]
+
+    assert answers == [f"reply to {n}" for n in range(4)]
+
+
+def test_failed_exchange_is_raised_and_its_client_retired(fake_client, monkeypatch):
+    with pytest.raises(RuntimeError, match="exchange failed"):
+        execute.query_claude_sync("boom")
+
+    assert execute.query_claude_sync("a") == "reply to a"
+    failed = [client for client in fake_client.instances if "boom" in client.prompts]
+    assert [client.prompts for client in failed] == [["boom"]]
+
+    _shut_down_pool(monkeypatch)
+    assert failed[0].disconnected_by_owner
+
+
+def test_shutdown_disconnects_every_client(fake_client, monkeypatch):
+    execute.query_claude_batch([("a",), ("b",), ("c",)])
+
+    _shut_down_pool(monkeypatch)
+
+    assert len(fake_client.instances) >= 3
+    assert all(client.disconnected_by_owner for client in fake_client.instances)
+    assert not execute._client_owners
+    assert not execute._ready_clients
+    assert execute._spare_count == 0
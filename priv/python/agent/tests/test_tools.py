@@ -0,0 +1,171 @@
+import asyncio
+import random
+import re
+
+import httpx
+import pytest
+
+from meadow_metadata_agent import tools
+from meadow_metadata_agent.tools import (
+    _has_mutation,
+    generate_description,
+    generate_description_tool,
+    generate_keywords,
+    graphql_query_tool,
+)
+
+
+def _original_keywords(content, context, max_keywords):
+    # generate_keywords_tool before the Counter rewrite
+    words = re.findall(r'\b\w+\b', content.lower())
+    context_words = re.findall(r'\b\w+\b', context.lower()) if context else []
+
+    word_freq = {}
+    for word in words + context_words:
+        if len(word) > 3:
+            word_freq[word] = word_freq.get(word, 0) + 1
+
+    return ", ".join(sorted(word_freq.keys(), key=lambda x: word_freq[x], reverse=True)[:max_keywords])
+
+
+def _original_description(content, context, max_length):
+    # generate_description_tool before the single-pass rewrite
+    description = "Analysis of content"
+    if context:
+        description += f" in context of {context}"
+    description += f": {content[:100]}..."
+    if len(description) > max_length:
+        description = description[:max_length-3] + "..."
+    return description
+
+
+@pytest.mark.parametrize("document, expected", [
+    ("{ works { id } }", False),
+    ("query Works { works { id } }", False),
+    ("mutation { updateWork(id: 1) { id } }", True),
+    ("# leading comment\n  mutation { updateWork(id: 1) { id } }", True),
+    ("fragment F on Work { id } mutation { updateWork(id: 1) { ...F } }", True),
+    ("query A { works { id } } mutation B { deleteWork(id: 1) { id } }", True),
+    ('query Q($m: String = "mutation") { search(q: "mutation") { mutation } }', False),
+    ('query { a } """mutation""" query { b }', False),
+    ("# mutation\nquery { works { id } }", False),
+    ("mutationLike { id }", False),
+])
+def test_has_mutation_checks_every_top_level_operation(document, expected):
+    assert _has_mutation(document) is expected
+
+
+def test_graphql_query_tool_rejects_mutations_before_calling_the_endpoint():
+    result = asyncio.run(graphql_query_tool.handler({
+        "graphql_query": "fragment F on Work { id } mutation { deleteWork(id: 1) { ...F } }",
+        "graphql_vars": {},
+        "graphql_endpoint": "http://127.0.0.1:9/unreachable",
+    }))
+
+    assert result["content"][0]["text"] == "Error: mutations must use the graphql_mutation tool"
+
+
+@pytest.fixture
+def http_clients(monkeypatch):
+    """Record every httpx.AsyncClient the tools create, served by a mock transport."""
+    clients = []
+    real_client = httpx.AsyncClient
+
+    def handler(request):
+        if request.url.path == "/old-graphql":
+            return httpx.Response(301, headers={"Location": "/graphql"})
+        return httpx.Response(200, text='{"data": {"works": []}}')
+
+    def client_with_mock_transport(**kwargs):
+        client = real_client(transport=httpx.MockTransport(handler), **kwargs)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(tools.httpx, "AsyncClient", client_with_mock_transport)
+    return clients
+
+
+GRAPHQL_ARGS = {
+    "graphql_query": "{ works { id } }",
+    "graphql_vars": {},
+    "graphql_endpoint": "http://meadow.test/old-graphql",
+}
+
+
+def test_graphql_calls_off_the_agent_loop_follow_redirects_and_close_their_client(http_clients):
+    for _ in range(2):
+        result = asyncio.run(graphql_query_tool.handler(GRAPHQL_ARGS))
+        assert result["content"][0]["text"] == '{"data": {"works": []}}'
+
+    assert len(http_clients) == 2
+    assert all(client.is_closed for client in http_clients)
+
+
+def test_graphql_calls_on_the_agent_loop_share_one_client(http_clients):
+    from meadow_metadata_agent import execute
+
+    for _ in range(2):
+        execute._run(graphql_query_tool.handler(GRAPHQL_ARGS))
+
+    assert len(http_clients) == 1
+    assert not http_clients[0].is_closed
+    execute._run(tools.close_http_client())
+    assert http_clients[0].is_closed
+
+
+@pytest.mark.parametrize("content, context, max_length", [
+    ("", "", 400),
+    ("x" * 100, "", 400),
+    ("x" * 150, "collection", 400),
+    ("x" * 150, "collection", 60),
+    ("x" * 150, "collection", 41),
+    ("x" * 150, "c" * 300, 50),
+    ("short", "", 3),
+])
+def test_generate_description_edge_cases_match_original(content, context, max_length):
+    assert generate_description(content, context, max_length) == _original_description(content, context, max_length)
+
+
+def test_generate_description_matches_original_on_random_inputs():
+    rng = random.Random(15)
+    for _ in range(5000):
+        content = "x" * rng.randint(0, 200)
+        context = "y" * rng.choice([0, 0, 5, 50, 300])
+        max_length = rng.randint(3, 450)
+        expected = _original_description(content, context, max_length)
+        assert generate_description(content, context, max_length) == expected, (len(content), len(context), max_length)
+
+
+def test_generate_description_tool_wraps_generate_description():
+    result = asyncio.run(generate_description_tool.handler({
+        "content": "A photograph of the campus", "context": "University Archives", "max_length": 40,
+    }))
+
+    assert result["content"][0]["text"] == _original_description("A photograph of the campus", "University Archives", 40)
+
+
+@pytest.mark.parametrize("content, context, max_keywords", [
+    ("", "", 10),
+    ("gamma beta alpha beta gamma alpha delta", "", 10),
+    ("gamma beta alpha beta gamma alpha delta", "", 2),
+    ("the cat sat on the mat with the catalogue", "", 10),
+    ("Straße STRASSE straße İstanbul ÉCOLE école ΟΔΟΣ οδος", "", 10),
+    ("photo archive photo", "Archive collection archive", 2),
+    ("alpha beta gamma delta", "", 0),
+])
+def test_generate_keywords_edge_cases_match_original(content, context, max_keywords):
+    assert generate_keywords(content, context, max_keywords) == _original_keywords(content, context, max_keywords)
+
+
+def test_generate_keywords_matches_original_on_random_inputs():
+    vocabulary = [
+        "archive", "Archive", "ARCHIVES", "map", "maps", "photo_2020", "x1y2", "the",
+        "Straße", "STRASSE", "ÉCOLE", "école", "İstanbul", "naïve", "ΟΔΟΣ", "café", "north-west",
+    ]
+    rng = random.Random(4)
+    for _ in range(2000):
+        content = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 30)))
+        context = " ".join(rng.choice(vocabulary) for _ in range(rng.choice([0, 0, 3, 12])))
+        max_keywords = rng.randint(0, 15)
+        expected = _original_keywords(content, context, max_keywords)
+        assert generate_keywords(content, context, max_keywords) == expected, (content, context, max_keywords)
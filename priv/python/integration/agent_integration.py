@@ -1,4 +1,3 @@
-import asyncio
-from meadow_metadata_agent.execute import query_claude_general_local
+from meadow_metadata_agent.execute import query_claude_local_sync
 
-asyncio.run(query_claude_general_local(prompt, context_json))
+query_claude_local_sync(prompt, context_json)